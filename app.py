@@ -1,8 +1,16 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+import xlsxwriter
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pii_detector import PIIDetector
 import io
+import json
+import re
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
 
 # ------------------------------------------------------------
 # Page configuration
@@ -17,175 +25,316 @@ st.set_page_config(
 # ------------------------------------------------------------
 # Material-inspired soft UI (KFUPM-leaning green)
 # ------------------------------------------------------------
-st.markdown(
-    """
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-
-    :root {
-        --primary: #0F7C4A;          /* KFUPM-ish green */
-        --primary-strong: #065F38;
-        --primary-soft: #E6F3EC;
-        --bg: light-dark(#F4F5FB, #0F172A);
-        --surface: light-dark(#FFFFFF, #1E293B);
-        --surface-alt: light-dark(#F9FAFB, #334155);
-        --text-main: light-dark(#0F172A, #F1F5F9);
-        --text-muted: light-dark(#6B7280, #CBD5E1);
-        --border-subtle: light-dark(#E5E7EB, #475569);
-        --chip-bg: #EEF2FF;
-        color-scheme: light dark;
-    }
+@st.cache_data(show_spinner=False)
+def load_css() -> str:
+    # Read and minify assets/style.css once per process
+    css = (Path(__file__).parent / "assets" / "style.css").read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
 
-    .stApp {
-        background-color: var(--bg);
-        font-family: 'Inter', system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-    }
 
-    .block-container {
-        padding-top: 2.5rem;
-        padding-bottom: 2.5rem;
-        max-width: 1180px;
-    }
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
-    /* Header */
-    .app-header {
-        margin-bottom: 1.8rem;
-    }
+# ------------------------------------------------------------
+# Cached resources
+# ------------------------------------------------------------
+@st.cache_resource
+def get_detector():
+    """Build the detector once per process so its patterns are reused across reruns."""
+    return PIIDetector()
+
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def load_df(name: str, data: bytes) -> pd.DataFrame:
+    # Parsed once per upload; reruns from unrelated widgets skip the I/O. Uploads
+    # hold personal data, so only the last few are kept, and for an hour at most
+    if name.endswith(".csv"):
+        try:
+            df = pd.read_csv(io.BytesIO(data), engine="pyarrow")
+        except (pd.errors.ParserError, pa.ArrowInvalid):
+            # Arrow rejects short rows and, past its first block, quoted cells
+            # spanning lines; the default engine reads both
+            df = pd.read_csv(io.BytesIO(data))
+    else:
+        df = pd.read_excel(io.BytesIO(data))
+    if df.columns.has_duplicates:
+        df.columns = unique_column_names(df.columns)
+    return compact_dtypes(df)
+
+
+def unique_column_names(columns) -> list:
+    # Repeated headers get ".1", ".2", ... as pandas' default CSV engine does, so
+    # each label selects a single column
+    taken = set(columns)
+    seen = set()
+    names = []
+    for col in columns:
+        name, n = col, 0
+        while name in seen or (n > 0 and name in taken):
+            n += 1
+            name = f"{col}.{n}"
+        seen.add(name)
+        taken.add(name)
+        names.append(name)
+    return names
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    # Smaller integer types, and low-cardinality text as category so the
+    # detector only has to scan the distinct values. The dtypes as loaded are
+    # kept in attrs so the report can still show them
+    df.attrs["source_dtypes"] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    if len(df) > 0:
+        for col in df.select_dtypes(include=["object", "string"]).columns:
+            if df[col].nunique(dropna=True) / len(df) < 0.5:
+                df[col] = df[col].astype("category")
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def analyze_cached(file_bytes: bytes, name: str, sample_n: int) -> pd.DataFrame:
+    # Keyed on the raw upload bytes, so re-analysing the same file is instant
+    df = load_df(name, file_bytes)
+    # Column-level classification is stable on a random sample of rows
+    if len(df) > sample_n:
+        df = df.sample(n=sample_n, random_state=0)
+    results_df = get_detector().analyze_dataset(df)
+    if len(results_df) > 0:
+        results_df["Data Type"] = results_df["Column Name"].map(df.attrs["source_dtypes"])
+    return results_df
 
-    .app-title {
-        font-size: 2.1rem;
-        font-weight: 600;
-        letter-spacing: -0.03em;
-        color: var(--text-main);
-        margin-bottom: 0.25rem;
-    }
 
-    .app-subtitle {
-        font-size: 0.98rem;
-        color: var(--text-muted);
-        max-width: 650px;
-        line-height: 1.55;
+# ------------------------------------------------------------
+# Chart helpers (figure JSON cached on the plotted counts)
+# ------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def build_pie(risk_items: tuple) -> str:
+    labels = [cat for cat, _ in risk_items]
+    risk_colors = {
+        "High": "#DC2626",
+        "Medium": "#D97706",
+        "Low": "#16A34A",
     }
+    fig_pie = go.Figure(
+        data=[
+            go.Pie(
+                labels=labels,
+                values=[count for _, count in risk_items],
+                hole=0.45,
+                marker=dict(
+                    colors=[risk_colors.get(cat, "#9CA3AF") for cat in labels]
+                ),
+            )
+        ]
+    )
+    fig_pie.update_layout(
+        height=320,
+        margin=dict(l=10, r=10, t=40, b=10),
+        title_text="Columns by risk category",
+    )
+    return fig_pie.to_json()
+
+
+@st.cache_data(show_spinner=False)
+def build_bar(pii_items: tuple) -> str:
+    # Keep the chart small: top 20 types, the rest as "Other"
+    many_types = len(pii_items) > 20
+    if many_types:
+        other = sum(count for _, count in pii_items[20:])
+        pii_items = pii_items[:20] + (("Other", other),)
+    fig_bar = go.Figure(
+        data=[
+            go.Bar(
+                x=[count for _, count in pii_items],
+                y=[pii_type for pii_type, _ in pii_items],
+                orientation="h",
+                hoverinfo="skip" if many_types else None,
+            )
+        ]
+    )
+    fig_bar.update_layout(
+        height=320,
+        margin=dict(l=80, r=10, t=40, b=40),
+        title_text="Detected PII types (per column)",
+        xaxis_title="Number of columns",
+        yaxis_title="PII type",
+    )
+    return fig_bar.to_json()
 
-    .app-accent {
-        margin-top: 1rem;
-        width: 64px;
-        height: 3px;
-        border-radius: 999px;
-        background: linear-gradient(90deg, var(--primary), var(--primary-strong));
-    }
 
-    /* Cards */
-    .surface-card {
-        background-color: var(--surface);
-        border-radius: 18px;
-        border: 1px solid var(--border-subtle);
-        padding: 1.4rem 1.5rem;
-        box-shadow: 0 18px 40px rgba(15, 23, 42, 0.04);
-    }
+# ------------------------------------------------------------
+# Export helpers
+# ------------------------------------------------------------
+def write_frame(wb, ws, df: pd.DataFrame):
+    # constant_memory flushes each row once the next one starts, so cells are
+    # written strictly row by row; missing values are left blank
+    datetime_format = wb.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    date_format = wb.add_format({"num_format": "yyyy-mm-dd"})
+    time_format = wb.add_format({"num_format": "hh:mm:ss"})
+    duration_format = wb.add_format({"num_format": "[h]:mm:ss"})
+    ws.write_row(0, 0, [str(col) for col in df.columns])
+    for r, row in enumerate(df.itertuples(index=False), start=1):
+        for c, value in enumerate(row):
+            if pd.isna(value):
+                continue
+            # datetime is a subclass of date, so it is checked first
+            if isinstance(value, datetime):
+                ws.write_datetime(r, c, value.replace(tzinfo=None), datetime_format)
+            elif isinstance(value, date):
+                ws.write_datetime(r, c, value, date_format)
+            elif isinstance(value, time):
+                ws.write_datetime(r, c, value.replace(tzinfo=None), time_format)
+            elif isinstance(value, timedelta):
+                ws.write_datetime(r, c, value, duration_format)
+            elif isinstance(value, (float, np.floating)) and np.isinf(value):
+                # Excel has no infinity; written as text like pandas' inf_rep
+                ws.write_string(r, c, "inf" if value > 0 else "-inf")
+            else:
+                ws.write(r, c, value)
+
+
+def results_fingerprint(results_df: pd.DataFrame, sample_df: pd.DataFrame) -> int:
+    # Content hash computed once per analysis; the exports below are cached on it
+    # so reruns do not have to re-hash the DataFrames
+    return hash(
+        pd.util.hash_pandas_object(results_df).values.tobytes()
+        + pd.util.hash_pandas_object(sample_df).values.tobytes()
+    )
 
-    .surface-subtle {
-        background-color: var(--surface-alt);
-        border-radius: 18px;
-        border: 1px solid var(--border-subtle);
-        padding: 1.2rem 1.3rem;
-    }
 
-    .section-title {
-        font-size: 1.1rem;
-        font-weight: 600;
-        color: var(--text-main);
-        margin-bottom: 0.35rem;
-    }
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def build_csv(fingerprint: int, _results_df: pd.DataFrame) -> bytes:
+    # Arrow's multi-threaded CSV writer instead of pandas' Python formatting
+    buffer = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(_results_df, preserve_index=False), buffer)
+    return buffer.getvalue()
 
-    .section-hint {
-        font-size: 0.9rem;
-        color: var(--text-muted);
-        margin-bottom: 0.9rem;
-    }
 
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background-color: var(--surface);
-        border-right: 1px solid var(--border-subtle);
-    }
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def build_xlsx(fingerprint: int, _results_df: pd.DataFrame, _sample_df: pd.DataFrame) -> bytes:
+    # Serialised once per results set; later reruns reuse the bytes
+    buffer = io.BytesIO()
+    # Dataset cells are written as plain text, never as formulas or links
+    wb = xlsxwriter.Workbook(
+        buffer,
+        {"constant_memory": True, "strings_to_formulas": False, "strings_to_urls": False},
+    )
+    write_frame(wb, wb.add_worksheet("PII analysis"), _results_df)
+    write_frame(wb, wb.add_worksheet("Dataset sample"), _sample_df)
+    wb.close()
+    return buffer.getvalue()
 
-    [data-testid="stSidebar"] h1 {
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 0.4rem;
-    }
 
-    /* File uploader */
-    [data-testid="stFileUploader"] {
-        border-radius: 16px;
-        border: 1.5px dashed var(--border-subtle);
-        background-color: var(--surface-alt);
-        padding: 1.4rem;
-    }
+# ------------------------------------------------------------
+# Results rendering
+# ------------------------------------------------------------
+@st.fragment
+def render_results():
+    # Download clicks rerun only this block, not the upload/preview above it
+    results_df = st.session_state["results_df"]
 
-    [data-testid="stFileUploader"]:hover {
-        border-color: var(--primary);
-    }
+    st.markdown("---")
+    st.markdown(
+        '<div class="section-title">Summary of findings</div>',
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        '<div class="section-hint">'
+        "Columns are grouped into broad risk categories to support decisions "
+        "about masking, anonymisation, or removal."
+        "</div>",
+        unsafe_allow_html=True,
+    )
 
-    /* Primary buttons */
-    .stButton > button {
-        border-radius: 999px;
-        background: var(--primary) !important;
-        color: white !important;
-        border: 1px solid var(--primary-strong) !important;
-        font-size: 0.92rem;
-        font-weight: 500;
-        padding: 0.4rem 1.4rem;
-        letter-spacing: 0.01em;
-        box-shadow: 0 12px 30px rgba(5, 122, 85, 0.25);
-        transition: all 0.16s ease;
-    }
+    c1, c2, c3, c4 = st.columns(4)
+    risk_counts = results_df["Risk Category"].value_counts()
+    high = risk_counts.get("High", 0)
+    med = risk_counts.get("Medium", 0)
+    low = risk_counts.get("Low", 0)
+    avg_risk = results_df["Risk Score"].mean()
 
-    .stButton > button:hover {
-        background: var(--primary-strong) !important;
-        transform: translateY(-1px);
-        box-shadow: 0 16px 38px rgba(5, 122, 85, 0.3);
-    }
+    c1.metric("High risk", high)
+    c2.metric("Medium risk", med)
+    c3.metric("Low risk", low)
+    c4.metric("Average risk", f"{avg_risk:.1f}%")
 
-    /* Metrics */
-    [data-testid="metric-container"] {
-        border-radius: 16px;
-        padding: 0.6rem 0.8rem;
-        background-color: var(--surface);
-        border: 1px solid var(--border-subtle);
-    }
+    # Visual overview
+    st.markdown(
+        '<div class="section-title" style="margin-top:1.2rem;">Visual overview</div>',
+        unsafe_allow_html=True,
+    )
+    v1, v2 = st.columns(2)
 
-    /* Dataframe */
-    .stDataFrame {
-        border-radius: 16px;
-        border: 1px solid var(--border-subtle);
-    }
+    with v1:
+        st.plotly_chart(
+            json.loads(build_pie(tuple(risk_counts.items()))),
+            use_container_width=True,
+        )
 
-    /* Download buttons */
-    .stDownloadButton > button {
-        border-radius: 999px !important;
-        background-color: var(--surface) !important;
-        color: var(--text-main) !important;
-        border: 1px solid var(--border-subtle) !important;
-        font-size: 0.9rem !important;
-        padding: 0.4rem 1.3rem !important;
-        transition: all 0.15s ease;
-    }
+    with v2:
+        pii_counts = results_df["PII Type"].value_counts()
+        st.plotly_chart(
+            json.loads(build_bar(tuple(pii_counts.items()))),
+            use_container_width=True,
+        )
 
-    .stDownloadButton > button:hover {
-        border-color: var(--primary) !important;
-        color: var(--primary) !important;
-        box-shadow: 0 10px 24px rgba(15, 23, 42, 0.08);
-    }
+    # Column-level details
+    st.markdown(
+        '<div class="section-title">Column-level details</div>',
+        unsafe_allow_html=True,
+    )
+    st.markdown(
+        '<div class="section-hint">'
+        "Each row describes one flagged column, including its PII type, "
+        "risk assessment, and a suggested action."
+        "</div>",
+        unsafe_allow_html=True,
+    )
+    st.dataframe(
+        results_df,
+        use_container_width=True,
+        height=420,
+        column_config={
+            "Risk Score": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+
+    # Export
+    st.markdown(
+        '<div class="section-title">Export options</div>',
+        unsafe_allow_html=True,
+    )
+    ex1, ex2 = st.columns(2)
+
+    with ex1:
+        csv_data = build_csv(
+            st.session_state["_results_fp"], results_df
+        )
+        st.download_button(
+            label="Download report as CSV",
+            data=csv_data,
+            file_name="privacy_audit_report.csv",
+            mime="text/csv",
+        )
+
+    with ex2:
+        xlsx_data = build_xlsx(
+            st.session_state["_results_fp"],
+            results_df,
+            st.session_state["source_df"].head(100),
+        )
+        st.download_button(
+            label="Download report as Excel",
+            data=xlsx_data,
+            file_name="privacy_audit_report.xlsx",
+            mime=(
+                "application/vnd.openxmlformats-officedocument."
+                "spreadsheetml.sheet"
+            ),
+        )
 
-    p {
-        line-height: 1.6;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
 
 # ------------------------------------------------------------
 # Main Application
@@ -266,10 +415,7 @@ def main():
         if uploaded_file is not None:
             try:
                 # Load dataset
-                if uploaded_file.name.endswith(".csv"):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                df = load_df(uploaded_file.name, uploaded_file.getvalue())
 
                 st.success(
                     f"File loaded successfully: {len(df)} rows × {len(df.columns)} columns."
@@ -284,16 +430,34 @@ def main():
                     with m2:
                         st.metric("Columns", len(df.columns))
                     with m3:
-                        mem_kb = df.memory_usage(deep=True).sum() / 1024
+                        mem_kb = df.memory_usage(deep=False).sum() / 1024
                         st.metric("Approx. memory", f"{mem_kb:.1f} KB")
 
+                # Opt-in fast scan on a row sample for large datasets
+                sample_n = len(df)
+                if len(df) > 1000:
+                    with st.sidebar:
+                        st.markdown("#### Scan settings")
+                        sample_n = st.slider(
+                            "Scan sample size",
+                            1000,
+                            len(df),
+                            len(df),
+                            help=(
+                                "Rows sampled for the scan; every row is scanned by default. "
+                                "Below the maximum, uniqueness, risk scores and counts are "
+                                "computed from the sample only."
+                            ),
+                        )
+
                 # Run analysis
                 run = st.button("Run privacy analysis")
 
                 if run:
                     with st.spinner("Scanning columns for possible personal data..."):
-                        detector = PIIDetector()
-                        results_df = detector.analyze_dataset(df)
+                        results_df = analyze_cached(
+                            uploaded_file.getvalue(), uploaded_file.name, sample_n
+                        )
 
                     if len(results_df) == 0:
                         st.info(
@@ -308,147 +472,16 @@ def main():
                         )
                         st.session_state["results_df"] = results_df
                         st.session_state["source_df"] = df
+                        st.session_state["_results_fp"] = results_fingerprint(
+                            results_df, df.head(100)
+                        )
 
                 # Results section
                 if (
                     "results_df" in st.session_state
                     and st.session_state["results_df"] is not None
                 ):
-                    results_df = st.session_state["results_df"]
-
-                    st.markdown("---")
-                    st.markdown(
-                        '<div class="section-title">Summary of findings</div>',
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        '<div class="section-hint">'
-                        "Columns are grouped into broad risk categories to support decisions "
-                        "about masking, anonymisation, or removal."
-                        "</div>",
-                        unsafe_allow_html=True,
-                    )
-
-                    c1, c2, c3, c4 = st.columns(4)
-                    high = len(results_df[results_df["Risk Category"] == "High"])
-                    med = len(results_df[results_df["Risk Category"] == "Medium"])
-                    low = len(results_df[results_df["Risk Category"] == "Low"])
-                    avg_risk = (
-                        results_df["Risk Score"]
-                        .str.replace("%", "")
-                        .astype(float)
-                        .mean()
-                    )
-
-                    c1.metric("High risk", high)
-                    c2.metric("Medium risk", med)
-                    c3.metric("Low risk", low)
-                    c4.metric("Average risk", f"{avg_risk:.1f}%")
-
-                    # Visual overview
-                    st.markdown(
-                        '<div class="section-title" style="margin-top:1.2rem;">Visual overview</div>',
-                        unsafe_allow_html=True,
-                    )
-                    v1, v2 = st.columns(2)
-
-                    with v1:
-                        risk_counts = results_df["Risk Category"].value_counts()
-                        risk_colors = {
-                            "High": "#DC2626",
-                            "Medium": "#D97706",
-                            "Low": "#16A34A",
-                        }
-                        fig_pie = go.Figure(
-                            data=[
-                                go.Pie(
-                                    labels=list(risk_counts.index),
-                                    values=list(risk_counts.values),
-                                    hole=0.45,
-                                    marker=dict(
-                                        colors=[
-                                            risk_colors.get(cat, "#9CA3AF")
-                                            for cat in risk_counts.index
-                                        ]
-                                    ),
-                                )
-                            ]
-                        )
-                        fig_pie.update_layout(
-                            height=320,
-                            margin=dict(l=10, r=10, t=40, b=10),
-                            title_text="Columns by risk category",
-                        )
-                        st.plotly_chart(fig_pie, use_container_width=True)
-
-                    with v2:
-                        pii_counts = results_df["PII Type"].value_counts()
-                        fig_bar = go.Figure(
-                            data=[
-                                go.Bar(
-                                    x=list(pii_counts.values),
-                                    y=list(pii_counts.index),
-                                    orientation="h",
-                                )
-                            ]
-                        )
-                        fig_bar.update_layout(
-                            height=320,
-                            margin=dict(l=80, r=10, t=40, b=40),
-                            title_text="Detected PII types (per column)",
-                            xaxis_title="Number of columns",
-                            yaxis_title="PII type",
-                        )
-                        st.plotly_chart(fig_bar, use_container_width=True)
-
-                    # Column-level details
-                    st.markdown(
-                        '<div class="section-title">Column-level details</div>',
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        '<div class="section-hint">'
-                        "Each row describes one flagged column, including its PII type, "
-                        "risk assessment, and a suggested action."
-                        "</div>",
-                        unsafe_allow_html=True,
-                    )
-                    st.dataframe(results_df, use_container_width=True, height=420)
-
-                    # Export
-                    st.markdown(
-                        '<div class="section-title">Export options</div>',
-                        unsafe_allow_html=True,
-                    )
-                    ex1, ex2 = st.columns(2)
-
-                    with ex1:
-                        csv_data = results_df.to_csv(index=False)
-                        st.download_button(
-                            label="Download report as CSV",
-                            data=csv_data,
-                            file_name="privacy_audit_report.csv",
-                            mime="text/csv",
-                        )
-
-                    with ex2:
-                        buffer = io.BytesIO()
-                        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                            results_df.to_excel(
-                                writer, index=False, sheet_name="PII analysis"
-                            )
-                            st.session_state["source_df"].head(100).to_excel(
-                                writer, index=False, sheet_name="Dataset sample"
-                            )
-                        st.download_button(
-                            label="Download report as Excel",
-                            data=buffer.getvalue(),
-                            file_name="privacy_audit_report.xlsx",
-                            mime=(
-                                "application/vnd.openxmlformats-officedocument."
-                                "spreadsheetml.sheet"
-                            ),
-                        )
+                    render_results()
 
             except Exception as e:
                 st.error(f"Error reading file: {e}")
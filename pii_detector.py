@@ -1,28 +1,71 @@
+import os
 import re
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import Dict, List, Tuple, Any
 
+try:
+    import hyperscan  # Optional: PIIDetector(engine='hyperscan')
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2  # Optional: google-re2, PIIDetector(engine='re2')
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # Optional: pyahocorasick for column-name keyword matching
+except ImportError:
+    ahocorasick = None
+
 class PIIDetector:
     """
     Detects Personally Identifiable Information (PII) in datasets using
     pattern-based detection and column name heuristics.
     """
     
-    def __init__(self):
-        # PII patterns using regular expressions
+    # Priority order: More specific patterns should win over generic ones
+    # Credit cards are longer and more specific than phone numbers
+    _PRIORITY_ORDER = ('CREDIT_CARD', 'SSN', 'IBAN', 'EMAIL', 'PHONE', 'IP_ADDRESS',
+                       'GPS_COORDINATES', 'DATE_OF_BIRTH', 'NATIONAL_ID', 'ADDRESS', 'URL')
+    
+    # Common non-PII column names
+    _NON_PII_KEYWORDS = frozenset({'essay', 'description', 'comment', 'notes', 'text', 'content',
+                                   'body', 'message', 'post', 'article', 'paragraph', 'statement',
+                                   'summary', 'review', 'feedback', 'provider', 'company', 'organization',
+                                   'department', 'title', 'category', 'type', 'status', 'role'})
+    
+    def __init__(self, engine: str = 'arrow'):
+        """
+        Args:
+            engine: Pattern scanning engine. 'arrow' (default) runs Arrow's vectorised
+                regex kernels over whole columns; 'hyperscan' and 're2' opt in to a
+                multi-pattern engine that scans one value at a time from Python, and
+                fall back to 'arrow' when the library is not installed
+        """
+        if engine not in ('arrow', 'hyperscan', 're2'):
+            raise ValueError(f"Unknown pattern engine: {engine!r}")
+        
+        # PII patterns using regular expressions, kept as strings: Arrow, Hyperscan
+        # and RE2 each compile them natively
         self.pii_patterns = {
             'EMAIL': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
             'PHONE': r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b',
             'SSN': r'\b\d{3}-\d{2}-\d{4}\b',
             'CREDIT_CARD': r'\b(?:\d{4}[-\s]?){3}\d{4}\b|\b\d{13,19}\b',
             'IP_ADDRESS': r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b',
-            'URL': r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)',
+            'URL': r'https?://[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b',
             'DATE_OF_BIRTH': r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b',
             'NATIONAL_ID': r'\b[A-Z0-9]{8,12}\b',
             'GPS_COORDINATES': r'[-+]?\d{1,3}\.\d+,\s*[-+]?\d{1,3}\.\d+',
             'IBAN': r'\b[A-Z]{2}\d{2}[A-Z0-9]{4,30}\b',
-            'ADDRESS': r'\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)',
+            'ADDRESS': r'\d\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln)\b',
         }
         
         # Column name keywords for heuristic detection
@@ -41,6 +84,29 @@ class PIIDetector:
             'MEDICAL': ['medical_condition', 'diagnosis', 'medication', 'blood_type', 'medical', 'condition', 'disease', 'illness'],
         }
         
+        # Common non-PII column names (a frozenset, so exact names are one lookup)
+        self.non_pii_keywords = self._NON_PII_KEYWORDS
+        
+        # Column name matchers compiled once: a non-PII exclusion regex, and the
+        # PII keywords ranked longest first (e.g. "employee_id" before "id")
+        non_pii = '|'.join(re.escape(keyword) for keyword in sorted(self.non_pii_keywords))
+        self._non_pii_regex = re.compile(f'_(?:{non_pii})|(?:{non_pii})_')
+        
+        ranked = sorted(((pii_type, keyword) for pii_type, keywords in self.column_keywords.items()
+                         for keyword in keywords), key=lambda x: len(x[1]), reverse=True)
+        self._keyword_rank = {}
+        for rank, (pii_type, keyword) in enumerate(ranked):
+            self._keyword_rank.setdefault(keyword, (rank, pii_type))
+        
+        # Zero-width lookahead so overlapping "_keyword" / "keyword_" hits are all found
+        keywords = '|'.join(re.escape(keyword) for _, keyword in ranked)
+        self._keyword_regex = re.compile(f'(?=_({keywords})|({keywords})_)')
+        
+        # Aho-Corasick automatons find every keyword occurrence in one pass over the
+        # name (None when pyahocorasick is unavailable; the regexes are used instead)
+        self._non_pii_automaton = self._build_automaton(sorted(self.non_pii_keywords))
+        self._keyword_automaton = self._build_automaton([keyword for _, keyword in ranked])
+        
         # Impact scores for each PII type (1-5 scale)
         self.impact_scores = {
             'SSN': 5,
@@ -62,6 +128,424 @@ class PIIDetector:
             'IP_ADDRESS': 2,
             'URL': 1,
         }
+        
+        # Anonymization recommendation for each PII type
+        self.recommendations = {
+            'SSN': 'Tokenization or full masking (e.g., ***-**-1234)',
+            'CREDIT_CARD': 'Tokenization or partial masking (e.g., ****-****-****-1234)',
+            'NATIONAL_ID': 'Tokenization or hashing with salt',
+            'EMAIL': 'Hashing or partial masking (e.g., j***@example.com)',
+            'PHONE': 'Masking last 4 digits (e.g., ***-***-1234)',
+            'ADDRESS': 'Generalization to city/region level',
+            'GPS_COORDINATES': 'Reduce precision to neighborhood level',
+            'DATE_OF_BIRTH': 'Generalization to birth year only',
+            'DOB': 'Generalization to birth year only',
+            'NAME': 'Pseudonymization or tokenization',
+            'ID': 'Tokenization or hashing',
+            'SALARY': 'Generalization to salary ranges',
+            'MEDICAL': 'Remove or encrypt; strict access control required',
+            'IBAN': 'Tokenization or partial masking',
+            'IP_ADDRESS': 'Remove last octet (e.g., 192.168.1.***)',
+            'URL': 'Domain extraction only if needed',
+            'AGE': 'Generalization to age ranges (e.g., 20-30)',
+            'GENDER': 'Keep if necessary for analysis; consider aggregation',
+        }
+        
+        # Final recommendation text for every (PII type, risk category) pair; the None
+        # type holds the generic fallback
+        prefixes = {'High': '🔴 URGENT:', 'Medium': '🟡', 'Low': '🟢'}
+        base_recommendations = {**self.recommendations, None: 'Apply appropriate anonymization technique'}
+        self._action_table = {(pii_type, category): f"{prefix} {base}"
+                              for pii_type, base in base_recommendations.items()
+                              for category, prefix in prefixes.items()}
+        
+        # Pattern priority, highest first
+        self.priority_order = self._PRIORITY_ORDER
+        
+        # Datasets with more cells than this are scanned column-parallel in threads
+        self.parallel_threshold = 1_000_000
+        
+        # Distinct values scanned per step before checking for an early exit
+        self.scan_chunk_size = 4096
+        
+        # Literal every match of a pattern must contain; on the Arrow path a plain
+        # substring search gates each of these patterns before its regex runs
+        self.prefilter_literals = {
+            'EMAIL': '@',
+            'URL': '://',
+            'SSN': '-',
+            'IP_ADDRESS': '.',
+            'GPS_COORDINATES': ',',
+        }
+        
+        # Columns with more rows than this are first classified from a row sample
+        self.sample_min_rows = 5000
+        self.sample_rows = 1000
+        
+        # Rows sampled to estimate the average value length
+        self.length_sample_rows = 100
+        
+        # Column name heuristic results by lowercased name
+        self.heuristic_cache_size = 10_000
+        self._heuristic_cache = {}
+        
+        # Hyperscan scratch space cannot be shared between concurrent scans, so
+        # each thread allocates its own on first use
+        self._thread_local = threading.local()
+        
+        # All PII patterns merged into one Hyperscan database or one RE2 set when
+        # that engine is selected (both None on the default Arrow engine)
+        self._pattern_types = list(self.pii_patterns)
+        self._priority_ids = [self._pattern_types.index(pii_type) for pii_type in self.priority_order]
+        self._pattern_db = self._build_pattern_db() if engine == 'hyperscan' else None
+        self._pattern_set = self._build_pattern_set() if engine == 're2' else None
+        
+        # Otherwise patterns go through Arrow's regex kernels; any the kernels
+        # reject are dropped once here instead of failing on every scan
+        if self._pattern_db is None and self._pattern_set is None:
+            self._arrow_types = self._validate_arrow_patterns()
+        else:
+            self._arrow_types = set(self._pattern_types)
+        self._combined_pattern = '|'.join(f'(?:{pattern})' for pii_type, pattern in self.pii_patterns.items()
+                                          if pii_type in self._arrow_types)
+    
+    def _build_automaton(self, keywords: List[str]):
+        """
+        Build an Aho-Corasick automaton over a list of keywords.
+        
+        Args:
+            keywords: Keywords to match
+            
+        Returns:
+            ahocorasick.Automaton, or None if pyahocorasick is not installed
+        """
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _boundary_hits(automaton, name: str) -> List[str]:
+        """
+        Find keywords occurring in a name as "_keyword" or "keyword_".
+        
+        Args:
+            automaton: Aho-Corasick automaton built by _build_automaton
+            name: Lowercased column name
+            
+        Returns:
+            Keywords with at least one word boundary occurrence
+        """
+        hits = []
+        for end, keyword in automaton.iter(name):
+            start = end - len(keyword) + 1
+            if (start > 0 and name[start - 1] == '_') or name[end + 1:end + 2] == '_':
+                hits.append(keyword)
+        return hits
+    
+    def _build_pattern_db(self):
+        """
+        Compile every PII pattern into a single Hyperscan block-mode database.
+        
+        Returns:
+            Compiled hyperscan.Database, or None if hyperscan is not installed
+        """
+        if hyperscan is None:
+            return None
+        
+        expressions = [pattern.encode() for pattern in self.pii_patterns.values()]
+        pattern_db = hyperscan.Database()
+        pattern_db.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            # Report each pattern at most once per scanned value
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+        )
+        return pattern_db
+    
+    def _build_pattern_set(self):
+        """
+        Compile every PII pattern into a single RE2 search set.
+        
+        Returns:
+            Compiled re2.Set, or None if google-re2 is not installed
+        """
+        if re2 is None:
+            return None
+        
+        pattern_set = re2.Set.SearchSet()
+        for pattern in self.pii_patterns.values():
+            pattern_set.Add(pattern)
+        pattern_set.Compile()
+        return pattern_set
+    
+    def _scratch(self):
+        """
+        Return the calling thread's Hyperscan scratch space for the pattern database.
+        
+        Returns:
+            hyperscan.Scratch bound to the pattern database
+        """
+        scratch = getattr(self._thread_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._thread_local.scratch = hyperscan.Scratch(self._pattern_db)
+        return scratch
+    
+    def _validate_arrow_patterns(self) -> set:
+        """
+        Check which PII patterns Arrow's regex kernels can compile.
+        
+        Returns:
+            Set of PII types whose patterns Arrow accepts; a warning names each one dropped
+        """
+        probe = pa.array([''], type=pa.string())
+        valid = set()
+        for pii_type, pattern in self.pii_patterns.items():
+            try:
+                pc.match_substring_regex(probe, pattern)
+            except pa.ArrowInvalid as exc:
+                warnings.warn(f"{pii_type} pattern is not supported by Arrow and will be skipped: {exc}")
+                continue
+            valid.add(pii_type)
+        return valid
+    
+    def _multi_match_counts(self, string_data: pd.Series, weights: np.ndarray) -> np.ndarray:
+        """
+        Count the rows matched by each PII pattern using a multi-pattern engine.
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            
+        Returns:
+            Weighted match count per pattern, in pii_patterns order
+        """
+        n_patterns = len(self._pattern_types)
+        
+        # One SIMD pass per value; with HS_FLAG_SINGLEMATCH the callback fires at most
+        # once per pattern and value and only flags it in a preallocated hit matrix.
+        # One weighted reduction over the matrix then gives the per-pattern counts
+        if self._pattern_db is not None:
+            hits = np.zeros((len(string_data), n_patterns), dtype=np.uint8)
+            
+            def on_match(pattern_id, start, end, flags, row):
+                hits[row, pattern_id] = 1
+            
+            scratch = self._scratch()
+            for row, value in enumerate(string_data):
+                self._pattern_db.scan(value.encode(), match_event_handler=on_match, context=row, scratch=scratch)
+            
+            return weights @ hits
+        
+        # One linear scan per value reports every matching pattern at once
+        matched = np.zeros(n_patterns)
+        for value, weight in zip(string_data, weights):
+            for pattern_id in self._pattern_set.Match(value) or ():
+                matched[pattern_id] += weight
+        return matched
+    
+    def _match_counts(self, string_data: pd.Series, weights: np.ndarray) -> np.ndarray:
+        """
+        Count the rows matched by each PII pattern with whichever engine is available.
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            
+        Returns:
+            Weighted match count per pattern, in pii_patterns order
+        """
+        if self._pattern_db is not None or self._pattern_set is not None:
+            return self._multi_match_counts(string_data, weights)
+        
+        values = pa.array(string_data, type=pa.string())
+        matched = np.zeros(len(self._pattern_types))
+        for pattern_id, (pii_type, pattern) in enumerate(self.pii_patterns.items()):
+            if pii_type not in self._arrow_types:
+                continue
+            pattern_values, pattern_weights = self._prefilter(values, weights, pii_type)
+            hits = pc.match_substring_regex(pattern_values, pattern).to_numpy(zero_copy_only=False)
+            matched[pattern_id] = pattern_weights[hits].sum()
+        return matched
+    
+    def _prefilter(self, values: pa.Array, weights: np.ndarray, pii_type: str) -> Tuple[pa.Array, np.ndarray]:
+        """
+        Keep only the values containing the literal a PII pattern requires.
+        
+        Args:
+            values: Distinct string values of a column, as an Arrow array
+            weights: Row count of each distinct value
+            pii_type: PII type whose pattern is about to run
+            
+        Returns:
+            Tuple of (values that can match, their row counts); unchanged when the
+            pattern has no required literal
+        """
+        literal = self.prefilter_literals.get(pii_type)
+        if literal is None:
+            return values, weights
+        
+        # Substring search is a memchr-style scan, far cheaper than the regex
+        mask = pc.match_substring(values, literal)
+        return pc.filter(values, mask), weights[mask.to_numpy(zero_copy_only=False)]
+    
+    def _sample_rows(self, weights: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw a seeded random sample of rows from a column held as distinct values.
+        
+        Args:
+            weights: Row count of each distinct value
+            size: Number of rows to draw, without replacement
+            
+        Returns:
+            Tuple of (distinct value positions, sampled row count of each)
+        """
+        rng = np.random.default_rng(0)
+        rows = rng.choice(weights.sum(), size, replace=False)
+        return np.unique(np.searchsorted(np.cumsum(weights), rows, side='right'), return_counts=True)
+    
+    def _scan_sample(self, string_data: pd.Series, weights: np.ndarray) -> Tuple[str, float]:
+        """
+        Estimate the PII type of a large column from a random sample of its rows.
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            
+        The sample only picks the type; its confidence is the exact ratio of that one
+        pattern over the whole column.
+        
+        Returns:
+            Tuple of (PII_TYPE, confidence_score), or None if the sample is ambiguous
+        """
+        sample_index, sample_weights = self._sample_rows(weights, self.sample_rows)
+        ratios = self._match_counts(string_data.iloc[sample_index], sample_weights) / self.sample_rows
+        
+        for pii_type, pattern_id in zip(self.priority_order, self._priority_ids):
+            match_ratio = ratios[pattern_id]
+            # Clear hit in the sample: confirm it on every distinct value
+            if match_ratio > 0.7:
+                match_ratio = self._pattern_count(string_data, weights, pattern_id) / weights.sum()
+                return (pii_type, match_ratio) if match_ratio > 0.5 else None
+            # Ambiguous: confirm with a full scan
+            if match_ratio >= 0.3:
+                return None
+        
+        return None, 0.0
+    
+    def _pattern_count(self, string_data: pd.Series, weights: np.ndarray, pattern_id: int) -> float:
+        """
+        Count the rows matched by a single PII pattern over all distinct values.
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            pattern_id: Position of the pattern in pii_patterns
+            
+        Returns:
+            Weighted match count of the pattern
+        """
+        if self._pattern_db is not None or self._pattern_set is not None:
+            return self._multi_match_counts(string_data, weights)[pattern_id]
+        
+        pii_type = self._pattern_types[pattern_id]
+        values, weights = self._prefilter(pa.array(string_data, type=pa.string()), weights, pii_type)
+        hits = pc.match_substring_regex(values, self.pii_patterns[pii_type]).to_numpy(zero_copy_only=False)
+        return weights[hits].sum()
+    
+    def _scan_all_patterns(self, string_data: pd.Series, weights: np.ndarray) -> Tuple[str, float]:
+        """
+        Pick the PII type for a column with a multi-pattern engine (Hyperscan or RE2).
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            
+        Returns:
+            Tuple of (PII_TYPE, confidence_score)
+        """
+        total = weights.sum()
+        half = 0.5 * total
+        matched = np.zeros(len(self._pattern_types))
+        remaining = total
+        
+        for start in range(0, len(string_data), self.scan_chunk_size):
+            chunk_weights = weights[start:start + self.scan_chunk_size]
+            matched += self._multi_match_counts(string_data[start:start + self.scan_chunk_size], chunk_weights)
+            remaining -= chunk_weights.sum()
+            
+            # Stop once no pattern can still match more than half of the rows
+            if (matched + remaining <= half).all():
+                return None, 0.0
+        
+        # Check high-priority patterns first
+        for pii_type, pattern_id in zip(self.priority_order, self._priority_ids):
+            match_ratio = matched[pattern_id] / total
+            if match_ratio > 0.5:
+                return pii_type, match_ratio
+        
+        return None, 0.0
+    
+    def _scan_by_priority(self, string_data: pd.Series, weights: np.ndarray) -> Tuple[str, float]:
+        """
+        Pick the PII type for a column with Arrow compute kernels, one pattern at a time.
+        
+        Patterns run in priority order and the first one matching more than half of the
+        rows wins, so lower-priority patterns are never evaluated after a hit.
+        
+        Args:
+            string_data: Distinct string values of a column
+            weights: Row count of each distinct value
+            
+        Returns:
+            Tuple of (PII_TYPE, confidence_score)
+        """
+        total = weights.sum()
+        half = 0.5 * total
+        
+        # Arrow compute kernels run each regex in C++ over one contiguous UTF-8 buffer.
+        # One pass with the combined alternation finds candidate values; individual
+        # patterns then only run over those candidates
+        values = pa.array(string_data, type=pa.string())
+        candidates = pc.match_substring_regex(values, self._combined_pattern)
+        values = pc.filter(values, candidates)
+        weights = weights[candidates.to_numpy(zero_copy_only=False)]
+        candidate_total = weights.sum()
+        
+        if candidate_total <= half:
+            return None, 0.0
+        
+        for pii_type in self.priority_order:
+            if pii_type not in self._arrow_types:
+                continue
+            pattern = self.pii_patterns[pii_type]
+            pattern_values, pattern_weights = self._prefilter(values, weights, pii_type)
+            matched = 0
+            remaining = pattern_weights.sum()
+            
+            # Too few values hold the required literal for this pattern to win
+            if remaining <= half:
+                continue
+            
+            for start in range(0, len(pattern_values), self.scan_chunk_size):
+                chunk = pattern_values.slice(start, self.scan_chunk_size)
+                chunk_weights = pattern_weights[start:start + self.scan_chunk_size]
+                hits = pc.match_substring_regex(chunk, pattern).to_numpy(zero_copy_only=False)
+                matched += chunk_weights[hits].sum()
+                remaining -= chunk_weights.sum()
+                
+                # This pattern can no longer match more than half of the rows
+                if matched + remaining <= half:
+                    break
+            
+            if matched > half:
+                return pii_type, matched / total
+        
+        return None, 0.0
     
     def detect_pattern_based(self, column_data: pd.Series) -> Tuple[str, float]:
         """
@@ -73,62 +557,80 @@ class PIIDetector:
         Returns:
             Tuple of (PII_TYPE, confidence_score)
         """
+        return self._detect_from_counts(column_data, self._value_counts(column_data))
+    
+    def _value_counts(self, column_data: pd.Series) -> pd.Series:
+        """
+        Count the non-null rows of each distinct value in a column.
+        
+        Args:
+            column_data: Pandas Series containing column data
+            
+        Returns:
+            Series of row counts indexed by distinct value
+        """
+        counts = column_data.value_counts(sort=False)
+        # Unused categories are listed with a zero count
+        return counts[counts > 0]
+    
+    def _detect_from_counts(self, column_data: pd.Series, counts: pd.Series) -> Tuple[str, float]:
+        """
+        Pattern-based detection over a column's precomputed value counts.
+        
+        Args:
+            column_data: Pandas Series containing column data
+            counts: Non-null row count of each distinct value, from _value_counts
+            
+        Returns:
+            Tuple of (PII_TYPE, confidence_score)
+        """
+        categorical = isinstance(column_data.dtype, pd.CategoricalDtype)
+        
         # Skip non-string columns
-        if column_data.dtype not in ['object', 'string']:
+        if not categorical and column_data.dtype not in ['object', 'string']:
             return None, 0.0
         
-        # Convert to string and remove NaN values
-        string_data = column_data.dropna().astype(str)
-        
-        if len(string_data) == 0:
+        if len(counts) == 0:
             return None, 0.0
         
-        # Calculate average length of values
-        avg_length = string_data.str.len().mean()
+        # Patterns run once per distinct value; row counts weight the results.
+        # Mixed object columns are compared by their string form instead
+        if not categorical and pd.api.types.infer_dtype(counts.index, skipna=True) != 'string':
+            counts = column_data.dropna().astype(str).value_counts(sort=False)
+        
+        string_data = pd.Series(counts.index.astype(str))
+        weights = counts.to_numpy()
+        
+        # Calculate average length of values (estimated from a row sample on larger columns)
+        if weights.sum() > self.length_sample_rows:
+            length_index, length_weights = self._sample_rows(weights, self.length_sample_rows)
+        else:
+            length_index, length_weights = np.arange(len(weights)), weights
+        lengths = pc.utf8_length(pa.array(string_data.iloc[length_index], type=pa.string())).to_numpy()
+        avg_length = (lengths * length_weights).sum() / length_weights.sum()
         
         # If average length is very long (>500 chars), it's likely essay/description text
         # These columns may contain PII mentions but aren't PII columns themselves
         if avg_length > 500:
             return None, 0.0
         
-        # Test each pattern
-        pattern_matches = {}
-        for pii_type, pattern in self.pii_patterns.items():
-            try:
-                matches = string_data.str.contains(pattern, regex=True, na=False).sum()
-                match_ratio = matches / len(string_data)
-                
-                # For shorter text (likely actual PII fields), also check content density
-                if match_ratio > 0.3:  # If pattern matches
-                    # Sample first non-null value to check density
-                    sample = string_data.iloc[0] if len(string_data) > 0 else ""
-                    
-                    # If the matched pattern is a small part of much longer text, skip it
-                    if len(sample) > 200:  # Long text field
-                        continue
-                    
-                    pattern_matches[pii_type] = match_ratio
-            except:
-                continue
+        # Sample first non-null value (by position, as index labels may repeat after
+        # pd.concat) to check density: if it is a long text field, any matched
+        # pattern is only a small part of it
+        sample = str(column_data.iloc[column_data.notna().to_numpy().argmax()])
+        if len(sample) > 200:
+            return None, 0.0
         
-        # Find best match with priority handling
-        if pattern_matches:
-            # Priority order: More specific patterns should win over generic ones
-            # Credit cards are longer and more specific than phone numbers
-            priority_order = ['CREDIT_CARD', 'SSN', 'IBAN', 'EMAIL', 'PHONE', 'IP_ADDRESS', 
-                            'GPS_COORDINATES', 'DATE_OF_BIRTH', 'NATIONAL_ID', 'ADDRESS', 'URL']
-            
-            # Check high-priority patterns first
-            for pii_type in priority_order:
-                if pii_type in pattern_matches and pattern_matches[pii_type] > 0.5:
-                    return pii_type, pattern_matches[pii_type]
-            
-            # If no high-confidence high-priority match, use best match
-            best_match = max(pattern_matches.items(), key=lambda x: x[1])
-            if best_match[1] > 0.5:
-                return best_match[0], best_match[1]
+        # Large columns: decide from a row sample unless it is ambiguous
+        if weights.sum() > self.sample_min_rows:
+            sampled = self._scan_sample(string_data, weights)
+            if sampled is not None:
+                return sampled
         
-        return None, 0.0
+        # The first pattern in priority order matching more than half of the rows wins
+        if self._pattern_db is not None or self._pattern_set is not None:
+            return self._scan_all_patterns(string_data, weights)
+        return self._scan_by_priority(string_data, weights)
     
     def detect_column_name_heuristic(self, column_name: str) -> Tuple[str, float]:
         """
@@ -142,36 +644,49 @@ class PIIDetector:
         """
         column_name_lower = column_name.lower().strip()
         
-        # Exclude common non-PII column names
-        non_pii_keywords = ['essay', 'description', 'comment', 'notes', 'text', 'content', 
-                           'body', 'message', 'post', 'article', 'paragraph', 'statement',
-                           'summary', 'review', 'feedback', 'provider', 'company', 'organization',
-                           'department', 'title', 'category', 'type', 'status', 'role']
+        # The result depends only on the name, so each name is matched once
+        cached = self._heuristic_cache.get(column_name_lower)
+        if cached is None:
+            cached = self._match_column_name(column_name_lower)
+            if len(self._heuristic_cache) >= self.heuristic_cache_size:
+                self._heuristic_cache.clear()
+            self._heuristic_cache[column_name_lower] = cached
+        return cached
+    
+    def _match_column_name(self, column_name_lower: str) -> Tuple[str, float]:
+        """
+        Match a lowercased column name against the PII keyword lists.
         
-        for keyword in non_pii_keywords:
-            if keyword == column_name_lower or f'_{keyword}' in column_name_lower or f'{keyword}_' in column_name_lower:
-                return None, 0.0
+        Args:
+            column_name_lower: Lowercased, stripped column name
+            
+        Returns:
+            Tuple of (PII_TYPE, confidence_score)
+        """
+        # Exclude common non-PII column names: exact names by set lookup, then
+        # keywords delimited by an underscore
+        if column_name_lower in self.non_pii_keywords:
+            return None, 0.0
+        if self._non_pii_automaton is not None:
+            non_pii = self._boundary_hits(self._non_pii_automaton, column_name_lower)
+        else:
+            non_pii = self._non_pii_regex.search(column_name_lower)
+        if non_pii:
+            return None, 0.0
+        
+        # Exact match gets higher confidence
+        exact = self._keyword_rank.get(column_name_lower)
+        if exact:
+            return exact[1], 0.9
         
-        # Sort by keyword length (longest first) to avoid partial matches
-        # e.g., check for "employee_id" before just "id"
-        sorted_items = []
-        for pii_type, keywords in self.column_keywords.items():
-            for keyword in keywords:
-                sorted_items.append((pii_type, keyword))
-        
-        # Sort by keyword length descending
-        sorted_items.sort(key=lambda x: len(x[1]), reverse=True)
-        
-        for pii_type, keyword in sorted_items:
-            if keyword in column_name_lower:
-                # Exact match gets higher confidence
-                if keyword == column_name_lower:
-                    return pii_type, 0.9
-                # Check if it's a word boundary match (not part of another word)
-                elif f'_{keyword}' in column_name_lower or f'{keyword}_' in column_name_lower:
-                    return pii_type, 0.8
-                elif keyword == column_name_lower.split('_')[-1] or keyword == column_name_lower.split('_')[0]:
-                    return pii_type, 0.7
+        # Word boundary match (not part of another word); longest keyword wins
+        if self._keyword_automaton is not None:
+            hits = self._boundary_hits(self._keyword_automaton, column_name_lower)
+        else:
+            hits = [match.group(1) or match.group(2) for match in self._keyword_regex.finditer(column_name_lower)]
+        if hits:
+            keyword = min(hits, key=lambda hit: self._keyword_rank[hit][0])
+            return self._keyword_rank[keyword][1], 0.8
         
         return None, 0.0
     
@@ -185,11 +700,14 @@ class PIIDetector:
         Returns:
             Uniqueness score between 0 and 1
         """
-        if len(column_data) == 0:
+        total_count = len(column_data)
+        if total_count == 0:
             return 0.0
         
-        unique_count = column_data.nunique()
-        total_count = len(column_data)
+        # pd.unique only collects distinct values, without counting them; nulls are
+        # not counted as values
+        unique_values = pd.unique(column_data)
+        unique_count = len(unique_values) - pd.isna(unique_values).sum()
         
         return unique_count / total_count
     
@@ -236,35 +754,74 @@ class PIIDetector:
         Returns:
             Recommended anonymization action
         """
-        recommendations = {
-            'SSN': 'Tokenization or full masking (e.g., ***-**-1234)',
-            'CREDIT_CARD': 'Tokenization or partial masking (e.g., ****-****-****-1234)',
-            'NATIONAL_ID': 'Tokenization or hashing with salt',
-            'EMAIL': 'Hashing or partial masking (e.g., j***@example.com)',
-            'PHONE': 'Masking last 4 digits (e.g., ***-***-1234)',
-            'ADDRESS': 'Generalization to city/region level',
-            'GPS_COORDINATES': 'Reduce precision to neighborhood level',
-            'DATE_OF_BIRTH': 'Generalization to birth year only',
-            'DOB': 'Generalization to birth year only',
-            'NAME': 'Pseudonymization or tokenization',
-            'ID': 'Tokenization or hashing',
-            'SALARY': 'Generalization to salary ranges',
-            'MEDICAL': 'Remove or encrypt; strict access control required',
-            'IBAN': 'Tokenization or partial masking',
-            'IP_ADDRESS': 'Remove last octet (e.g., 192.168.1.***)',
-            'URL': 'Domain extraction only if needed',
-            'AGE': 'Generalization to age ranges (e.g., 20-30)',
-            'GENDER': 'Keep if necessary for analysis; consider aggregation',
-        }
+        action = self._action_table.get((pii_type, risk_category))
+        if action is None:
+            # Unknown types get the generic advice; any other category reads as Low
+            if risk_category not in ("High", "Medium"):
+                risk_category = "Low"
+            action = self._action_table.get((pii_type, risk_category), self._action_table[None, risk_category])
+        return action
+    
+    def _analyze_column(self, column: str, column_data: pd.Series) -> Dict[str, Any]:
+        """
+        Run detection and risk scoring for a single column.
+        
+        Args:
+            column: Name of the column
+            column_data: Pandas Series containing column data
+            
+        Returns:
+            Report row for the column, or None if no PII was detected
+        """
+        # One value_counts pass feeds pattern detection, uniqueness and the null count
+        counts = self._value_counts(column_data)
+        unique_count = len(counts)
+        null_count = len(column_data) - counts.sum()
         
-        base_recommendation = recommendations.get(pii_type, 'Apply appropriate anonymization technique')
+        # Pattern-based detection
+        pattern_type, pattern_conf = self._detect_from_counts(column_data, counts)
         
-        if risk_category == "High":
-            return f"🔴 URGENT: {base_recommendation}"
-        elif risk_category == "Medium":
-            return f"🟡 {base_recommendation}"
+        # Column name heuristic detection
+        heuristic_type, heuristic_conf = self.detect_column_name_heuristic(column)
+        
+        # Combine detections (prioritize higher confidence)
+        if pattern_conf > heuristic_conf:
+            pii_type = pattern_type
+            confidence = pattern_conf
+            detection_method = "Pattern-Based"
+        elif heuristic_conf > 0:
+            pii_type = heuristic_type
+            confidence = heuristic_conf
+            detection_method = "Column Name Heuristic"
         else:
-            return f"🟢 {base_recommendation}"
+            pii_type = None
+            confidence = 0.0
+            detection_method = "None"
+        
+        if not pii_type:
+            return None
+        
+        # Calculate metrics for the detected PII
+        uniqueness = unique_count / len(column_data) if len(column_data) > 0 else 0.0
+        impact = self.impact_scores.get(pii_type, 2)
+        risk_score = self.calculate_risk_score(pii_type, impact, uniqueness)
+        risk_category = self.categorize_risk(risk_score)
+        recommendation = self.recommend_action(pii_type, risk_category)
+        
+        return {
+            'Column Name': column,
+            'PII Type': pii_type,
+            'Detection Method': detection_method,
+            'Confidence': confidence,
+            'Impact': impact,
+            'Uniqueness': uniqueness,
+            'Risk Score': round(risk_score, 2),
+            'Risk Category': risk_category,
+            'Recommended Action': recommendation,
+            'Data Type': str(column_data.dtype),
+            'Unique Values': unique_count,
+            'Null Count': null_count,
+        }
     
     def analyze_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -276,50 +833,28 @@ class PIIDetector:
         Returns:
             DataFrame with analysis results
         """
-        results = []
+        # Only string columns can match a pattern; any other column is reported only
+        # on a column name hit, so the rest are skipped without reading their data
+        string_columns = set(df.select_dtypes(include=['object', 'string', 'category']).columns)
+        columns = [column for column in df.columns
+                   if column in string_columns or self.detect_column_name_heuristic(column)[0]]
+
+        # Columns are independent, so large datasets are scanned in a thread pool; the
+        # pandas, Arrow and RE2 kernels release the GIL and the columns are shared, not copied
+        workers = min(os.cpu_count() or 1, len(columns))
+        if workers > 1 and len(df) * len(columns) > self.parallel_threshold:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                rows = list(executor.map(self._analyze_column, columns, [df[column] for column in columns]))
+        else:
+            rows = [self._analyze_column(column, df[column]) for column in columns]
         
-        for column in df.columns:
-            # Pattern-based detection
-            pattern_type, pattern_conf = self.detect_pattern_based(df[column])
-            
-            # Column name heuristic detection
-            heuristic_type, heuristic_conf = self.detect_column_name_heuristic(column)
-            
-            # Combine detections (prioritize higher confidence)
-            if pattern_conf > heuristic_conf:
-                pii_type = pattern_type
-                confidence = pattern_conf
-                detection_method = "Pattern-Based"
-            elif heuristic_conf > 0:
-                pii_type = heuristic_type
-                confidence = heuristic_conf
-                detection_method = "Column Name Heuristic"
-            else:
-                pii_type = None
-                confidence = 0.0
-                detection_method = "None"
-            
-            # Calculate metrics if PII detected
-            if pii_type:
-                uniqueness = self.calculate_uniqueness(df[column])
-                impact = self.impact_scores.get(pii_type, 2)
-                risk_score = self.calculate_risk_score(pii_type, impact, uniqueness)
-                risk_category = self.categorize_risk(risk_score)
-                recommendation = self.recommend_action(pii_type, risk_category)
-                
-                results.append({
-                    'Column Name': column,
-                    'PII Type': pii_type,
-                    'Detection Method': detection_method,
-                    'Confidence': f"{confidence:.2%}",
-                    'Impact': impact,
-                    'Uniqueness': f"{uniqueness:.2%}",
-                    'Risk Score': f"{risk_score:.2f}",
-                    'Risk Category': risk_category,
-                    'Recommended Action': recommendation,
-                    'Data Type': str(df[column].dtype),
-                    'Unique Values': df[column].nunique(),
-                    'Null Count': df[column].isna().sum(),
-                })
-        
-        return pd.DataFrame(results)
+        results = [row for row in rows if row is not None]
+        if not results:
+            return pd.DataFrame()
+        
+        # Ratios are kept as floats until here and formatted as percentages in one
+        # pass per column
+        report = pd.DataFrame(results)
+        for name in ('Confidence', 'Uniqueness'):
+            report[name] = report[name].map('{:.2%}'.format)
+        return report